@@ -0,0 +1,215 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+
+/* Bjoern Hoehrmann's UTF-8 DFA: the first 256 entries map bytes to character
+   classes, the rest maps (state + class) to the next state. */
+static const uint8_t utf8_dfa[] = {
+  0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+  0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+  0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+  0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+  1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,
+  7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,
+  8,8,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,
+  10,3,3,3,3,3,3,3,3,3,3,3,3,4,3,3,11,6,6,6,5,8,8,8,8,8,8,8,8,8,8,8,
+
+  0,12,24,36,60,96,84,12,12,12,48,72,12,12,12,12,12,12,12,12,12,12,12,12,
+  12,0,12,12,12,12,12,0,12,0,12,12,12,24,12,12,12,12,12,24,12,24,12,12,
+  12,12,12,12,12,12,12,24,12,12,12,12,12,24,12,12,12,12,12,12,12,24,12,12,
+  12,12,12,12,12,12,12,36,12,36,12,12,12,36,12,12,12,12,12,36,12,36,12,12,
+  12,36,12,12,12,12,12,12,12,12,12,12,
+};
+
+#define UTF8_ACCEPT 0
+#define UTF8_REJECT 12
+
+
+static Py_ssize_t
+varint_read(const uint8_t *data, Py_ssize_t len, uint32_t *value)
+{
+  uint32_t word = 0;
+  uint32_t stop;
+  Py_ssize_t size;
+
+  if (len > 0 && data[0] < 0x80) {
+    *value = data[0];
+    return 1;
+  }
+  for (Py_ssize_t i = 0; i < 4 && i < len; i++)
+    word |= (uint32_t)data[i] << (8 * i);
+  stop = ~word & 0x80808080u;
+  if (stop == 0) {
+    if (len < 5)
+      return 0;
+    if (data[4] & 0x80)
+      return -1;
+    size = 5;
+  }
+  else
+    size = __builtin_ctz(stop) / 8 + 1;
+  if (size > len)
+    return 0;
+  *value = (word & 0x7f)
+    | ((word >> 1) & (0x7fu << 7))
+    | ((word >> 2) & (0x7fu << 14))
+    | ((word >> 3) & (0x7fu << 21));
+  if (size == 5)
+    *value |= (uint32_t)data[4] << 28;
+  else
+    *value &= (1u << (7 * size)) - 1;
+  return size;
+}
+
+static Py_ssize_t
+varlong_read(const uint8_t *data, Py_ssize_t len, uint64_t *value)
+{
+  uint64_t result = 0;
+
+  for (Py_ssize_t i = 0; i < 10; i++) {
+    if (i >= len)
+      return 0;
+    result |= (uint64_t)(data[i] & 0x7f) << (7 * i);
+    if (!(data[i] & 0x80)) {
+      *value = result;
+      return i + 1;
+    }
+  }
+  return -1;
+}
+
+static Py_ssize_t
+var_write(uint64_t value, uint8_t *out)
+{
+  Py_ssize_t size = 0;
+
+  while (value >= 0x80) {
+    out[size++] = (uint8_t)(value | 0x80);
+    value >>= 7;
+  }
+  out[size++] = (uint8_t)value;
+  return size;
+}
+
+static int
+utf8_valid(const uint8_t *data, Py_ssize_t len)
+{
+  uint32_t state = UTF8_ACCEPT;
+
+  for (Py_ssize_t i = 0; i < len && state != UTF8_REJECT; i++)
+    state = utf8_dfa[256 + state + utf8_dfa[data[i]]];
+  return state == UTF8_ACCEPT;
+}
+
+
+static PyObject *
+parse_varint(PyObject *self, PyObject *args)
+{
+  Py_buffer buffer;
+  uint32_t value;
+  Py_ssize_t size;
+
+  if (!PyArg_ParseTuple(args, "y*", &buffer))
+    return NULL;
+  size = varint_read(buffer.buf, buffer.len, &value);
+  PyBuffer_Release(&buffer);
+  if (size == 0) {
+    PyErr_SetString(PyExc_ValueError, "VarIntEncoder: Parsing error: VarInt is truncated");
+    return NULL;
+  }
+  if (size < 0) {
+    PyErr_SetString(PyExc_ValueError, "VarIntEncoder: Parsing error: VarInt is too big");
+    return NULL;
+  }
+  return Py_BuildValue("(in)", (int32_t)value, size);
+}
+
+static PyObject *
+parse_varlong(PyObject *self, PyObject *args)
+{
+  Py_buffer buffer;
+  uint64_t value;
+  Py_ssize_t size;
+
+  if (!PyArg_ParseTuple(args, "y*", &buffer))
+    return NULL;
+  size = varlong_read(buffer.buf, buffer.len, &value);
+  PyBuffer_Release(&buffer);
+  if (size == 0) {
+    PyErr_SetString(PyExc_ValueError, "VarLongEncoder: Parsing error: VarLong is truncated");
+    return NULL;
+  }
+  if (size < 0) {
+    PyErr_SetString(PyExc_ValueError, "VarLongEncoder: Parsing error: VarLong is too big");
+    return NULL;
+  }
+  return Py_BuildValue("(Ln)", (long long)(int64_t)value, size);
+}
+
+static PyObject *
+serialize_varint(PyObject *self, PyObject *arg)
+{
+  uint8_t out[5];
+  int overflow;
+  long long value = PyLong_AsLongLongAndOverflow(arg, &overflow);
+
+  if (value == -1 && PyErr_Occurred())
+    return NULL;
+  if (overflow || value < INT32_MIN || value > INT32_MAX)
+    return PyErr_Format(PyExc_ValueError,
+      "VarIntEncoder: Serialization error: %S is not in range [-2147483648, 2147483647]", arg);
+  return PyBytes_FromStringAndSize((char *)out, var_write((uint32_t)value, out));
+}
+
+static PyObject *
+serialize_varlong(PyObject *self, PyObject *arg)
+{
+  uint8_t out[10];
+  int overflow;
+  long long value = PyLong_AsLongLongAndOverflow(arg, &overflow);
+
+  if (value == -1 && PyErr_Occurred())
+    return NULL;
+  if (overflow)
+    return PyErr_Format(PyExc_ValueError,
+      "VarLongEncoder: Serialization error: %S is not in range [-9223372036854775808, 9223372036854775807]", arg);
+  return PyBytes_FromStringAndSize((char *)out, var_write((uint64_t)value, out));
+}
+
+static PyObject *
+valid_utf8(PyObject *self, PyObject *args)
+{
+  Py_buffer buffer;
+  int valid;
+
+  if (!PyArg_ParseTuple(args, "y*", &buffer))
+    return NULL;
+  valid = utf8_valid(buffer.buf, buffer.len);
+  PyBuffer_Release(&buffer);
+  return PyBool_FromLong(valid);
+}
+
+
+static PyMethodDef varint_methods[] = {
+  {"parse_varint", parse_varint, METH_VARARGS, "Parse a VarInt, returns (value, size)."},
+  {"parse_varlong", parse_varlong, METH_VARARGS, "Parse a VarLong, returns (value, size)."},
+  {"serialize_varint", serialize_varint, METH_O, "Serialize a VarInt."},
+  {"serialize_varlong", serialize_varlong, METH_O, "Serialize a VarLong."},
+  {"valid_utf8", valid_utf8, METH_VARARGS, "Check that a buffer is valid UTF-8 without decoding it."},
+  {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef varint_module = {
+  PyModuleDef_HEAD_INIT,
+  "_varint",
+  "C implementation of the VarInt/VarLong encoders and UTF-8 validation.",
+  -1,
+  varint_methods
+};
+
+PyMODINIT_FUNC
+PyInit__varint(void)
+{
+  return PyModule_Create(&varint_module);
+}
@@ -1,22 +1,160 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from functools import lru_cache
 from data_types import Identifier, Slot, Position
 import json
+import math
 import struct
 import re
 
-
-@dataclass(slots=True)
-class EncoderParseResult[T]:
-  value: T
-  size: int
+try:
+  import _varint
+except ImportError:
+  _varint = None
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+if orjson is not None:
+  def _json_loads(data: memoryview) -> object:
+    try:
+      return orjson.loads(data)
+    except orjson.JSONDecodeError as error:
+      raise ValueError(f"JSONTextComponentEncoder: Parsing error: {error}") from None
+
+  def _json_dumps(value: object) -> bytes:
+    try:
+      return orjson.dumps(value)
+    except orjson.JSONEncodeError as error:
+      raise ValueError(f"JSONTextComponentEncoder: Serialization error: {error}") from None
+else:
+  # The stdlib fallback is restricted to what orjson accepts and produces, so
+  # both backends put the same bytes on the wire and reject the same input.
+  def _reject_constant(name: str) -> object:
+    raise ValueError(f"{name} is not valid JSON")
+
+  def _parse_json_float(text: str) -> float:
+    if not math.isfinite(value := float(text)):
+      raise ValueError("number is infinity when parsed as double")
+    return value
+
+  def _parse_json_int(text: str) -> int | float:
+    value = int(text)
+    return value if -0x8000000000000000 <= value <= 0xffffffffffffffff else float(value)
+
+  def _check_json_strings(value: object) -> None:
+    if isinstance(value, str):
+      value.encode("utf-8")
+    elif isinstance(value, dict):
+      for key, item in value.items():
+        key.encode("utf-8")
+        _check_json_strings(item)
+    elif isinstance(value, list):
+      for item in value:
+        _check_json_strings(item)
+
+  def _json_loads(data: memoryview) -> object:
+    try:
+      text = str(data, "utf-8")
+      value = json.loads(
+        text,
+        parse_constant=_reject_constant,
+        parse_float=_parse_json_float,
+        parse_int=_parse_json_int
+      )
+      if "\\u" in text:
+        _check_json_strings(value)
+      return value
+    except UnicodeEncodeError:
+      raise ValueError("JSONTextComponentEncoder: Parsing error: lone surrogate in string") from None
+    except ValueError as error:
+      raise ValueError(f"JSONTextComponentEncoder: Parsing error: {error}") from None
+
+  # repr() writes the exponent as e-05 and switches to it below 1e-4, orjson
+  # writes e-5 and only switches below 1e-5.
+  def _json_float(value: float) -> str:
+    text = float.__repr__(value)
+    if "e" not in text:
+      return text
+    mantissa, _, exponent = text.partition("e")
+    if int(exponent) == -5:
+      sign, digits = ("-", mantissa[1:]) if mantissa[0] == "-" else ("", mantissa)
+      return f"{sign}0.0000{digits.replace('.', '')}"
+    return f"{mantissa}e{int(exponent):+d}"
+
+  def _json_write(value: object, parts: list[str]) -> None:
+    if isinstance(value, str):
+      parts.append(json.dumps(value, ensure_ascii=False))
+    elif value is None or isinstance(value, bool):
+      parts.append("null" if value is None else "true" if value else "false")
+    elif isinstance(value, int):
+      if not -0x8000000000000000 <= value <= 0xffffffffffffffff:
+        raise ValueError("Integer exceeds 64-bit range")
+      parts.append(int.__repr__(value))
+    elif isinstance(value, float):
+      parts.append(_json_float(value) if math.isfinite(value) else "null")
+    elif isinstance(value, dict):
+      parts.append("{")
+      for index, (key, item) in enumerate(value.items()):
+        if not isinstance(key, str):
+          raise ValueError("Dict key must be str")
+        parts.append(f"{',' if index else ''}{json.dumps(key, ensure_ascii=False)}:")
+        _json_write(item, parts)
+      parts.append("}")
+    elif isinstance(value, (list, tuple)):
+      parts.append("[")
+      for index, item in enumerate(value):
+        if index:
+          parts.append(",")
+        _json_write(item, parts)
+      parts.append("]")
+    else:
+      raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+  def _json_dumps(value: object) -> bytes:
+    parts = []
+    try:
+      _json_write(value, parts)
+      return "".join(parts).encode("utf-8")
+    except (TypeError, ValueError, RecursionError) as error:
+      raise ValueError(f"JSONTextComponentEncoder: Serialization error: {error}") from None
+
+_S_b = struct.Struct(">b")
+_S_h = struct.Struct(">h")
+_S_H = struct.Struct(">H")
+_S_i = struct.Struct(">i")
+_S_q = struct.Struct(">q")
+_S_Q = struct.Struct(">Q")
+_S_f = struct.Struct(">f")
+_S_d = struct.Struct(">d")
+
+_unpack_b, _pack_b = _S_b.unpack_from, _S_b.pack
+_unpack_h, _pack_h = _S_h.unpack_from, _S_h.pack
+_unpack_H, _pack_H = _S_H.unpack_from, _S_H.pack
+_unpack_i, _pack_i = _S_i.unpack_from, _S_i.pack
+_unpack_q, _pack_q = _S_q.unpack_from, _S_q.pack
+_unpack_f, _pack_f = _S_f.unpack_from, _S_f.pack
+_unpack_d, _pack_d = _S_d.unpack_from, _S_d.pack
+_pack_Q = _S_Q.pack
+
+_FALSE = b"\x00"
+_TRUE = b"\x01"
+_U8 = tuple(bytes((i,)) for i in range(256))
+
+_match_identifier = re.compile(r"[a-z0-9_\-.]+:[a-z0-9_\-./]+").fullmatch
 
 
 class Encoder[T](ABC):
 
   @staticmethod
   @abstractmethod
-  def parse(data: bytes) -> EncoderParseResult[T]:
+  def parse(data: memoryview) -> tuple[T, int]:
     ...
 
 
@@ -26,340 +164,618 @@ class Encoder[T](ABC):
     ...
 
 
-class BooleanEncoder(Encoder[bool]):
-
   @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=bool(data[0]),
-      size=1
-    )
+  @abstractmethod
+  def serialize_into(value: T, out: bytearray) -> None:
+    ...
 
-  @staticmethod
-  def serialize(value: bool):
-    return value.to_bytes(1)
 
+def parse_bool(data: memoryview) -> tuple[bool, int]:
+  return bool(data[0]), 1
 
-class ByteEncoder(Encoder[int]):
+def serialize_bool(value: bool) -> bytes:
+  return _TRUE if value else _FALSE
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=int.from_bytes(data[:1], signed=True),
-      size=1
-    )
 
-  @staticmethod
-  def serialize(value: int):
-    if not -128 <= value <= 127:
-      raise ValueError(f"ByteEncoder: Serialization error: {value} is not in range [-128, 127]")
-    return value.to_bytes(1, signed=True)
+def parse_i8(data: memoryview) -> tuple[int, int]:
+  return _unpack_b(data)[0], 1
 
+def serialize_i8(value: int) -> bytes:
+  if not -128 <= value <= 127:
+    raise ValueError(f"ByteEncoder: Serialization error: {value} is not in range [-128, 127]")
+  return _pack_b(value)
 
-class UnsignedByteEncoder(Encoder[int]):
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=int.from_bytes(data[:1], signed=False),
-      size=1
-    )
+def parse_u8(data: memoryview) -> tuple[int, int]:
+  return data[0], 1
 
-  @staticmethod
-  def serialize(value: int):
-    if not 0 <= value <= 255:
-      raise ValueError(f"UnsignedByteEncoder: Serialization Error: {value} is not in range [0, 255]")
-    return value.to_bytes(1, signed=False)
+def serialize_u8(value: int) -> bytes:
+  if not 0 <= value <= 255:
+    raise ValueError(f"UnsignedByteEncoder: Serialization Error: {value} is not in range [0, 255]")
+  return _U8[value]
 
 
-class ShortEncoder(Encoder[int]):
+def parse_i16(data: memoryview) -> tuple[int, int]:
+  return _unpack_h(data)[0], 2
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=int.from_bytes(data[:2], byteorder="big", signed=True),
-      size=2
-    )
+def serialize_i16(value: int) -> bytes:
+  if not -32768 <= value <= 32767:
+    raise ValueError(f"ShortEncoder: Serialization error: {value} is not in range [-32768, 32767]")
+  return _pack_h(value)
 
 
-  @staticmethod
-  def serialize(value: int):
-    if not -32768 <= value <= 23767:
-      raise ValueError(f"ShortEncoder: Serialization error: {value} is not in range [-32768, 32767]")
-    return value.to_bytes(2, byteorder="big", signed=True)
+def parse_u16(data: memoryview) -> tuple[int, int]:
+  return _unpack_H(data)[0], 2
 
+def serialize_u16(value: int) -> bytes:
+  if not 0 <= value <= 65535:
+    raise ValueError(f"UnsignedShortEncoder: Serialization error {value} is not in range [0, 65535]")
+  return _pack_H(value)
 
-class UnsignedShortEncoder(Encoder[int]):
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      int.from_bytes(data[:2], byteorder="big", signed=False),
-      size=2
-    )
+def parse_i32(data: memoryview) -> tuple[int, int]:
+  return _unpack_i(data)[0], 4
 
-  @staticmethod
-  def serialize(value: int):
-    if not 0 <= value <= 65535:
-      raise ValueError(f"UnsignedShortEncoder: Serialization error {value} is not in range [0, 65535]")
-    return value.to_bytes(2, byteorder="big", signed=False)
+def serialize_i32(value: int) -> bytes:
+  if not -2147483648 <= value <= 2147483647:
+    raise ValueError(f"IntEncoder: Serialization error: {value} is not in range [-2147483648, 2147483647]")
+  return _pack_i(value)
 
 
-class IntEncoder(Encoder[int]):
+def parse_i64(data: memoryview) -> tuple[int, int]:
+  return _unpack_q(data)[0], 8
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=int.from_bytes(data[:4], byteorder="big", signed=True),
-      size=4
-    )
+def serialize_i64(value: int) -> bytes:
+  if not -9223372036854775808 <= value <= 9223372036854775807:
+    raise ValueError(f"LongEncoder: Serialization error: {value} is not in range [-9223372036854775808, 9223372036854775807]")
+  return _pack_q(value)
 
-  @staticmethod
-  def serialize(value: int):
-    if not -2147483648 <= value <= 2147483647:
-      raise ValueError(f"IntEncoder: Serialization error: {value} is not in range [-2147483648, 2147483647]")
-    return value.to_bytes(4, byteorder="big", signed=True)
 
+def parse_f32(data: memoryview) -> tuple[float, int]:
+  return _unpack_f(data)[0], 4
 
-class LongEncoder(Encoder[int]):
+def serialize_f32(value: float) -> bytes:
+  return _pack_f(value)
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=int.from_bytes(data[:8], byteorder="big", signed=True),
-      size=8
-    )
 
-  @staticmethod
-  def serialize(value: int):
-    if not -9223372036854775808 <= value <= 9223372036854775807:
-      raise ValueError(f"LongEncoder: Serialization error: {value} is not in range [-9223372036854775808, 9223372036854775807]")
-    return value.to_bytes(8, byteorder="big", signed=True)
+def parse_f64(data: memoryview) -> tuple[float, int]:
+  return _unpack_d(data)[0], 8
 
+def serialize_f64(value: float) -> bytes:
+  return _pack_d(value)
 
-class FloatEncoder(Encoder[float]):
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=struct.unpack(">f", data)[0],
-      size=4
-    )
-    
+# Counts come off the wire, so they are checked against the payload before a
+# Struct is built for them and cached.
+def _array_size(data: memoryview, count: int, width: int, name: str) -> int:
+  if not 0 <= count <= len(data) // width:
+    raise ValueError(f"{name}: Parsing error: Invalid array length {count} for {len(data)} bytes")
+  return count * width
 
-  @staticmethod
-  def serialize(value: float):
-    return struct.pack(">f", value)
+@lru_cache(maxsize=256)
+def _array_struct(code: str, count: int) -> struct.Struct:
+  return struct.Struct(f">{count}{code}")
 
+def _parse_array(data: memoryview, count: int, code: str, width: int, name: str):
+  size = _array_size(data, count, width, name)
+  return _array_struct(code, count).unpack_from(data), size
 
-class DoubleEncoder(Encoder[float]):
+# The ndarray is a read-only big-endian view on data: it keeps the caller's
+# buffer exported, so a bytearray behind it cannot be resized while it lives.
+def _parse_ndarray(data: memoryview, count: int, dtype: str, width: int, name: str):
+  if np is None:
+    raise ModuleNotFoundError("numpy is required to parse arrays as ndarray")
+  size = _array_size(data, count, width, name)
+  return np.frombuffer(data, dtype=dtype, count=count), size
 
-  @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=struct.unpack(">d", data)[0],
-      size=8
-    )
 
-  @staticmethod
-  def serialize(value: float):
-    return struct.pack(">d", value)
+def parse_i32_array(data: memoryview, count: int) -> tuple[tuple[int, ...], int]:
+  return _parse_array(data, count, "i", 4, "IntEncoder")
 
+def parse_i64_array(data: memoryview, count: int) -> tuple[tuple[int, ...], int]:
+  return _parse_array(data, count, "q", 8, "LongEncoder")
+
+def parse_f32_array(data: memoryview, count: int) -> tuple[tuple[float, ...], int]:
+  return _parse_array(data, count, "f", 4, "FloatEncoder")
+
+def parse_f64_array(data: memoryview, count: int) -> tuple[tuple[float, ...], int]:
+  return _parse_array(data, count, "d", 8, "DoubleEncoder")
+
+
+def parse_i32_ndarray(data: memoryview, count: int) -> tuple["np.ndarray", int]:
+  return _parse_ndarray(data, count, ">i4", 4, "IntEncoder")
+
+def parse_i64_ndarray(data: memoryview, count: int) -> tuple["np.ndarray", int]:
+  return _parse_ndarray(data, count, ">i8", 8, "LongEncoder")
+
+def parse_f32_ndarray(data: memoryview, count: int) -> tuple["np.ndarray", int]:
+  return _parse_ndarray(data, count, ">f4", 4, "FloatEncoder")
+
+def parse_f64_ndarray(data: memoryview, count: int) -> tuple["np.ndarray", int]:
+  return _parse_ndarray(data, count, ">f8", 8, "DoubleEncoder")
+
+
+def parse_varint(data: memoryview) -> tuple[int, int]:
+  if data and (byte := data[0]) < 0x80:
+    return byte, 1
+  # Load up to 5 bytes at once, the size is given by the first byte whose
+  # continuation bit is clear, then the 7-bit groups are packed together.
+  word = int.from_bytes(data[:5], "little")
+  stop = ~word & 0x8080808080
+  if stop == 0:
+    raise ValueError("VarIntEncoder: Parsing error: VarInt is too big")
+  size = ((stop & -stop).bit_length() + 7) // 8
+  if size > len(data):
+    raise ValueError("VarIntEncoder: Parsing error: VarInt is truncated")
+  value = (
+    (word & 0x7f)
+    | ((word >> 1) & (0x7f << 7))
+    | ((word >> 2) & (0x7f << 14))
+    | ((word >> 3) & (0x7f << 21))
+    | ((word >> 4) & (0x7f << 28))
+  ) & ((1 << (7 * size)) - 1) & 0xffffffff
+  if value & 0x80000000:
+    value -= 0x100000000
+  return value, size
+
+# For VarInt fields whose encoded size is known in advance (packet ids, small
+# enums), the continuation bits are not checked.
+def parse_varint_fixed_1(data: memoryview) -> tuple[int, int]:
+  return data[0] & 0x7f, 1
+
+def parse_varint_fixed_2(data: memoryview) -> tuple[int, int]:
+  return (data[0] & 0x7f) | (data[1] & 0x7f) << 7, 2
+
+def parse_varint_fixed_3(data: memoryview) -> tuple[int, int]:
+  return (data[0] & 0x7f) | (data[1] & 0x7f) << 7 | (data[2] & 0x7f) << 14, 3
+
+def serialize_varint(value: int) -> bytes:
+  if 0 <= value < 0x80:
+    return bytes((value,))
+  if not -2147483648 <= value <= 2147483647:
+    raise ValueError(f"VarIntEncoder: Serialization error: {value} is not in range [-2147483648, 2147483647]")
+  value &= 0xffffffff
+  if value < 1 << 14:
+    return bytes(((value & 0x7f) | 0x80, value >> 7))
+  if value < 1 << 21:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, value >> 14))
+  if value < 1 << 28:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, value >> 21))
+  return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, value >> 28))
+
+
+def parse_varlong(data: memoryview) -> tuple[int, int]:
+  if data and (byte := data[0]) < 0x80:
+    return byte, 1
+  value = 0
+  position = 0
+  size = 0
+
+  while True:
+    if size >= len(data):
+      raise ValueError("VarLongEncoder: Parsing error: VarLong is truncated")
+    current_byte = data[size]
+    value |= (current_byte & 0x7f) << position
+    if (current_byte & 0x80) == 0:
+      break
+    size += 1
+    position += 7
+    if position >= 64:
+      raise ValueError("VarLongEncoder: Parsing error: VarLong is too big")
+  value &= 0xffffffffffffffff
+  if value & 0x8000000000000000:
+    value -= 0x10000000000000000
+  return value, size + 1
+
+def serialize_varlong(value: int) -> bytes:
+  if 0 <= value < 0x80:
+    return bytes((value,))
+  if not -9223372036854775808 <= value <= 9223372036854775807:
+    raise ValueError(f"VarLongEncoder: Serialization error: {value} is not in range [-9223372036854775808, 9223372036854775807]")
+  value &= 0xffffffffffffffff
+  if value < 1 << 14:
+    return bytes(((value & 0x7f) | 0x80, value >> 7))
+  if value < 1 << 21:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, value >> 14))
+  if value < 1 << 28:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, value >> 21))
+  if value < 1 << 35:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, value >> 28))
+  if value < 1 << 42:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, (value >> 28 & 0x7f) | 0x80, value >> 35))
+  if value < 1 << 49:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, (value >> 28 & 0x7f) | 0x80, (value >> 35 & 0x7f) | 0x80, value >> 42))
+  if value < 1 << 56:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, (value >> 28 & 0x7f) | 0x80, (value >> 35 & 0x7f) | 0x80, (value >> 42 & 0x7f) | 0x80, value >> 49))
+  if value < 1 << 63:
+    return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, (value >> 28 & 0x7f) | 0x80, (value >> 35 & 0x7f) | 0x80, (value >> 42 & 0x7f) | 0x80, (value >> 49 & 0x7f) | 0x80, value >> 56))
+  return bytes(((value & 0x7f) | 0x80, (value >> 7 & 0x7f) | 0x80, (value >> 14 & 0x7f) | 0x80, (value >> 21 & 0x7f) | 0x80, (value >> 28 & 0x7f) | 0x80, (value >> 35 & 0x7f) | 0x80, (value >> 42 & 0x7f) | 0x80, (value >> 49 & 0x7f) | 0x80, (value >> 56 & 0x7f) | 0x80, value >> 63))
+
+
+def varint_size(value: int) -> int:
+  if not -2147483648 <= value <= 2147483647:
+    raise ValueError(f"VarIntEncoder: Serialization error: {value} is not in range [-2147483648, 2147483647]")
+  if value < 0:
+    return 5
+  return (value.bit_length() + 6) // 7 or 1
+
+def varlong_size(value: int) -> int:
+  if not -9223372036854775808 <= value <= 9223372036854775807:
+    raise ValueError(f"VarLongEncoder: Serialization error: {value} is not in range [-9223372036854775808, 9223372036854775807]")
+  if value < 0:
+    return 10
+  return (value.bit_length() + 6) // 7 or 1
+
+
+if _varint is not None:
+  parse_varint = _varint.parse_varint
+  serialize_varint = _varint.serialize_varint
+  parse_varlong = _varint.parse_varlong
+  serialize_varlong = _varint.serialize_varlong
+
+
+def valid_utf8(data: memoryview) -> bool:
+  try:
+    str(data, "utf-8")
+  except UnicodeDecodeError:
+    return False
+  return True
+
+if _varint is not None:
+  valid_utf8 = _varint.valid_utf8
+
+
+def parse_string(data: memoryview) -> tuple[str, int]:
+  length, length_size = parse_varint(data)
+  if not 0 <= length <= 32767 * 3:
+    raise ValueError(f"StringEncoder: Parsing error: Invalid length {length}")
+  end = length_size + length
+  if end > len(data):
+    raise ValueError(f"StringEncoder: Parsing error: Expected {length} bytes, got {len(data) - length_size}")
+  value = str(data[length_size:end], "utf-8")
+  if length > 32767 and len(value) > 32767:
+    raise ValueError(f"StringEncoder: Parsing error: Invalid string length {len(value)}")
+  return value, end
+
+def _encode_string(value: str) -> bytes:
+  if not 1 <= (length := len(value)) <= 32767:
+    raise ValueError(f"StringEncoder: Serialization error: Invalid string length {length}")
+  return value.encode("utf-8")
+
+def serialize_string(value: str) -> bytes:
+  data = _encode_string(value)
+  return serialize_varint(len(data)) + data
+
+
+def parse_json(data: memoryview) -> tuple[object, int]:
+  length, length_size = parse_varint(data)
+  if not 1 <= length <= 262144 * 3:
+    raise ValueError(f"JSONTextComponentEncoder: Parsing error: Expected [1, 262144 * 3] bytes, got {length}")
+  end = length_size + length
+  if end > len(data):
+    raise ValueError(f"JSONTextComponentEncoder: Parsing error: Expected {length} bytes, got {len(data) - length_size}")
+  return _json_loads(data[length_size:end]), end
+
+def _encode_json(value: object) -> bytes:
+  data = _json_dumps(value)
+  if not 1 <= (length := len(data)) <= 262144 * 3:
+    raise ValueError(f"JSONTextComponentEncoder: Serialization error: Expected [1, 262144 * 3] bytes, got {length}")
+  return data
+
+def serialize_json(value: object) -> bytes:
+  data = _encode_json(value)
+  return serialize_varint(len(data)) + data
+
+
+def parse_identifier(data: memoryview) -> tuple[Identifier, int]:
+  string, size = parse_string(data)
+  if not ":" in string:
+    string = f"minecraft:{string}"
+  if _match_identifier(string) is None:
+    raise ValueError(f"IdentifierEncoder: Parsing error: '{string}' is not a valid identifier")
+  namespace, _, name = string.partition(":")
+  return Identifier(namespace, name), size
+
+def serialize_identifier(value: Identifier) -> bytes:
+  return serialize_string(f"{value.namespace}:{value.name}")
+
+
+def parse_position(data: memoryview) -> tuple[Position, int]:
+  value = _unpack_q(data)[0]
+  z = value >> 12 & 0x3ffffff
+  y = value & 0xfff
+  return Position(
+    x=value >> 38,
+    y=y - 0x1000 if y & 0x800 else y,
+    z=z - 0x4000000 if z & 0x2000000 else z
+  ), 8
+
+def serialize_position(value: Position) -> bytes:
+  for coordinate in (value.x, value.z):
+    if not -33554432 <= coordinate <= 33554431:
+      raise ValueError(f"PositionEncoder: Serialization error: {coordinate} is not in range [-33554432, 33554431]")
+  if not -2048 <= value.y <= 2047:
+    raise ValueError(f"PositionEncoder: Serialization error: {value.y} is not in range [-2048, 2047]")
+  return _pack_Q((value.x & 0x3ffffff) << 38 | (value.z & 0x3ffffff) << 12 | (value.y & 0xfff))
+
+
+def serialize_bool_into(value: bool, out: bytearray) -> None:
+  out.append(1 if value else 0)
+
+def serialize_i8_into(value: int, out: bytearray) -> None:
+  if not -128 <= value <= 127:
+    raise ValueError(f"ByteEncoder: Serialization error: {value} is not in range [-128, 127]")
+  out.append(value & 0xff)
+
+def serialize_u8_into(value: int, out: bytearray) -> None:
+  if not 0 <= value <= 255:
+    raise ValueError(f"UnsignedByteEncoder: Serialization Error: {value} is not in range [0, 255]")
+  out.append(value)
+
+def serialize_i16_into(value: int, out: bytearray) -> None:
+  out += serialize_i16(value)
+
+def serialize_u16_into(value: int, out: bytearray) -> None:
+  out += serialize_u16(value)
+
+def serialize_i32_into(value: int, out: bytearray) -> None:
+  out += serialize_i32(value)
+
+def serialize_i64_into(value: int, out: bytearray) -> None:
+  out += serialize_i64(value)
+
+def serialize_f32_into(value: float, out: bytearray) -> None:
+  out += _pack_f(value)
+
+def serialize_f64_into(value: float, out: bytearray) -> None:
+  out += _pack_d(value)
+
+def serialize_varint_into(value: int, out: bytearray) -> None:
+  out += serialize_varint(value)
+
+def serialize_varlong_into(value: int, out: bytearray) -> None:
+  out += serialize_varlong(value)
+
+def serialize_string_into(value: str, out: bytearray) -> None:
+  data = _encode_string(value)
+  out += serialize_varint(len(data))
+  out += data
+
+def serialize_json_into(value: object, out: bytearray) -> None:
+  data = _encode_json(value)
+  out += serialize_varint(len(data))
+  out += data
+
+def serialize_identifier_into(value: Identifier, out: bytearray) -> None:
+  serialize_string_into(f"{value.namespace}:{value.name}", out)
+
+def serialize_position_into(value: Position, out: bytearray) -> None:
+  out += serialize_position(value)
+
+
+PARSERS = {
+  "boolean": parse_bool,
+  "byte": parse_i8,
+  "unsigned_byte": parse_u8,
+  "short": parse_i16,
+  "unsigned_short": parse_u16,
+  "int": parse_i32,
+  "long": parse_i64,
+  "float": parse_f32,
+  "double": parse_f64,
+  "string": parse_string,
+  "json_text_component": parse_json,
+  "identifier": parse_identifier,
+  "varint": parse_varint,
+  "varlong": parse_varlong,
+  "position": parse_position,
+  "angle": parse_u8,
+}
+
+SERIALIZERS = {
+  "boolean": serialize_bool,
+  "byte": serialize_i8,
+  "unsigned_byte": serialize_u8,
+  "short": serialize_i16,
+  "unsigned_short": serialize_u16,
+  "int": serialize_i32,
+  "long": serialize_i64,
+  "float": serialize_f32,
+  "double": serialize_f64,
+  "string": serialize_string,
+  "json_text_component": serialize_json,
+  "identifier": serialize_identifier,
+  "varint": serialize_varint,
+  "varlong": serialize_varlong,
+  "position": serialize_position,
+  "angle": serialize_u8,
+}
+
+SERIALIZERS_INTO = {
+  "boolean": serialize_bool_into,
+  "byte": serialize_i8_into,
+  "unsigned_byte": serialize_u8_into,
+  "short": serialize_i16_into,
+  "unsigned_short": serialize_u16_into,
+  "int": serialize_i32_into,
+  "long": serialize_i64_into,
+  "float": serialize_f32_into,
+  "double": serialize_f64_into,
+  "string": serialize_string_into,
+  "json_text_component": serialize_json_into,
+  "identifier": serialize_identifier_into,
+  "varint": serialize_varint_into,
+  "varlong": serialize_varlong_into,
+  "position": serialize_position_into,
+  "angle": serialize_u8_into,
+}
 
-class StringEncoder(Encoder[str]):
 
-  @staticmethod
-  def parse(data: bytes):
-    length = VarIntEncoder.parse(data)
-    if not 0 <= length.value <= 32767:
-      raise ValueError(f"StringEncoder: Parsing error: Invalid length {length.value}")
-    value = ""
-    i = 0
-    while len(value) < length.value:
-      for c_len in range(1, 4):
-        try:
-          c = data[i:i + c_len].decode("utf-8")
-        except UnicodeDecodeError:
-          continue
-        else:
-          value += c
-          i += c_len
-          break
-    return EncoderParseResult(
-      value=value,
-      size=length.size + len(value.encode("utf-8"))
-    )
+class BooleanEncoder(Encoder[bool]):
 
-  @staticmethod
-  def serialize(value: str):
-    if not 1 <= (length := len(value)) <= 32767:
-      raise ValueError(f"StringEncoder: Serialization error: Invalid string length {length}")
-    return VarIntEncoder.serialize(length) + value.encode("utf-8")
+  parse = staticmethod(parse_bool)
+  serialize = staticmethod(serialize_bool)
+  serialize_into = staticmethod(serialize_bool_into)
+
+
+class ByteEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_i8)
+  serialize = staticmethod(serialize_i8)
+  serialize_into = staticmethod(serialize_i8_into)
+
+
+class UnsignedByteEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_u8)
+  serialize = staticmethod(serialize_u8)
+  serialize_into = staticmethod(serialize_u8_into)
+
+
+class ShortEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_i16)
+  serialize = staticmethod(serialize_i16)
+  serialize_into = staticmethod(serialize_i16_into)
+
+
+class UnsignedShortEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_u16)
+  serialize = staticmethod(serialize_u16)
+  serialize_into = staticmethod(serialize_u16_into)
+
+
+class IntEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_i32)
+  parse_array = staticmethod(parse_i32_array)
+  parse_ndarray = staticmethod(parse_i32_ndarray)
+  serialize = staticmethod(serialize_i32)
+  serialize_into = staticmethod(serialize_i32_into)
+
+
+class LongEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_i64)
+  parse_array = staticmethod(parse_i64_array)
+  parse_ndarray = staticmethod(parse_i64_ndarray)
+  serialize = staticmethod(serialize_i64)
+  serialize_into = staticmethod(serialize_i64_into)
+
+
+class FloatEncoder(Encoder[float]):
+
+  parse = staticmethod(parse_f32)
+  parse_array = staticmethod(parse_f32_array)
+  parse_ndarray = staticmethod(parse_f32_ndarray)
+  serialize = staticmethod(serialize_f32)
+  serialize_into = staticmethod(serialize_f32_into)
+
+
+class DoubleEncoder(Encoder[float]):
+
+  parse = staticmethod(parse_f64)
+  parse_array = staticmethod(parse_f64_array)
+  parse_ndarray = staticmethod(parse_f64_ndarray)
+  serialize = staticmethod(serialize_f64)
+  serialize_into = staticmethod(serialize_f64_into)
+
+
+class StringEncoder(Encoder[str]):
+
+  parse = staticmethod(parse_string)
+  serialize = staticmethod(serialize_string)
+  serialize_into = staticmethod(serialize_string_into)
 
 
 class TextComponentEncoder(Encoder[str]):
 
   @staticmethod
-  def parse(data: bytes) -> str:
+  def parse(data: memoryview) -> str:
     return NotImplemented
 
   @staticmethod
   def serialize(value: str) -> bytes:
     return NotImplemented
 
-
-class JSONTextComponentEncoder[T](Encoder[T]):
-
   @staticmethod
-  def parse(data: bytes):
-    if not 1 <= (size := len(data)) <= 262144 * 3 + 3:
-      raise ValueError(f"JSONTextComponentEncoder: Parsing error: Expected [1, 262144 * 3 + 3] bytes, got {size}")
-    string = StringEncoder.parse(data)
-    return EncoderParseResult(
-      value=json.loads(string.value),
-      size=string.size
-    )
+  def serialize_into(value: str, out: bytearray) -> None:
+    return NotImplemented
 
-  @staticmethod
-  def serialize(value: T):
-    return StringEncoder.serialize(json.dumps(value))
 
+class JSONTextComponentEncoder[T](Encoder[T]):
 
-class IdentifierEncoder(Encoder[Identifier]):
+  parse = staticmethod(parse_json)
+  serialize = staticmethod(serialize_json)
+  serialize_into = staticmethod(serialize_json_into)
 
-  @staticmethod
-  def parse(data: bytes):
-    string = StringEncoder.parse(data)
-    if not ":" in string.value:
-      string.value = f"minecraft:{string.value}"
-      string.size += 10
-    if re.match(r"^[a-z0-9_\-.]+:[a-z0-9_\-./]+$", string.value) is None:
-      raise ValueError(f"IdentifierEncoder: Parsing error: '{string.value}' is not a valid identifier")
-    namespace, name = string.value.split(":")
-    return EncoderParseResult(
-      value=Identifier(namespace, name),
-      size=string.size
-    )
 
+class IdentifierEncoder(Encoder[Identifier]):
 
-  @staticmethod
-  def serialize(value: Identifier):
-    return StringEncoder.serialize(f"{value.namespace}:{value.name}")
+  parse = staticmethod(parse_identifier)
+  serialize = staticmethod(serialize_identifier)
+  serialize_into = staticmethod(serialize_identifier_into)
 
 
 class VarIntEncoder(Encoder[int]):
-  SEGMENT_BITS = 0x7f
-  CONTINUE_BIT = 0x80
-
-  @staticmethod
-  def parse(data: bytes):
-    value = 0
-    position = 0
-    size = 0
-
-    while True:
-      current_byte = ByteEncoder.parse(data[size:]).value
-      value |= (current_byte & VarIntEncoder.SEGMENT_BITS) << position
-      if (current_byte & VarIntEncoder.CONTINUE_BIT) == 0:
-        break
-      size += 1
-      position += 7
-      if position >= 32:
-        raise ValueError("VarIntEncoder: Parsing error: VarInt is too big")
-    return EncoderParseResult(
-      value=value,
-      size=size
-    )
 
-  @staticmethod
-  def serialize(value: int):
-    data = b""
-    while (value & ~VarIntEncoder.SEGMENT_BITS):
-      data += ByteEncoder.serialize((value & VarIntEncoder.SEGMENT_BITS) | VarIntEncoder.CONTINUE_BIT)
-      value = (value % 0x10000000) >> 7
-    return data + ByteEncoder.serialize(value)
+  parse = staticmethod(parse_varint)
+  parse_fixed_1 = staticmethod(parse_varint_fixed_1)
+  parse_fixed_2 = staticmethod(parse_varint_fixed_2)
+  parse_fixed_3 = staticmethod(parse_varint_fixed_3)
+  serialize = staticmethod(serialize_varint)
+  serialize_into = staticmethod(serialize_varint_into)
+  size = staticmethod(varint_size)
 
 
 class VarLongEncoder(Encoder[int]):
-  SEGMENT_BITS = 0x7f
-  CONTINUE_BIT = 0x80
-
-  @staticmethod
-  def parse(data: bytes):
-    value = 0
-    position = 0
-    size = 0
-
-    while True:
-      current_byte = ByteEncoder.parse(data[size:]).value
-      value |= (current_byte & VarLongEncoder.SEGMENT_BITS) << position
-      if (current_byte & VarLongEncoder.CONTINUE_BIT) == 0:
-        break
-      size += 1
-      position += 7
-      if position >= 64:
-        raise ValueError("VarLongEncoder: Parsing error: VarLong is too big")
-    return EncoderParseResult(
-      value=value,
-      size=size
-    )
 
-  @staticmethod
-  def serialize(value: int):
-    data = b""
-    while (value & ~VarLongEncoder.SEGMENT_BITS):
-      data += ByteEncoder.serialize((value & VarLongEncoder.SEGMENT_BITS) | VarLongEncoder.CONTINUE_BIT)
-      value = (value % 0x10000000000000000) >> 7
-    return data + ByteEncoder.serialize(value)
+  parse = staticmethod(parse_varlong)
+  serialize = staticmethod(serialize_varlong)
+  serialize_into = staticmethod(serialize_varlong_into)
+  size = staticmethod(varlong_size)
 
 
 class EntityMetadataEncoder(Encoder[None]):
 
   @staticmethod
-  def parse(data: bytes):
+  def parse(data: memoryview):
     return NotImplemented
 
   @staticmethod
   def serialize(value: None):
     return NotImplemented
 
+  @staticmethod
+  def serialize_into(value: None, out: bytearray):
+    return NotImplemented
+
 
 class SlotEncoder[T](Encoder[Slot[T]]):
 
   @staticmethod
-  def parse(data: bytes):
+  def parse(data: memoryview):
     return NotImplemented
 
   @staticmethod
   def serialize(value: Slot[T]):
     return NotImplemented
 
-class PositionEncoder(Encoder[Position]):
-
   @staticmethod
-  def parse(data: bytes):
-    return EncoderParseResult(
-      value=Position(
-        x=int.from_bytes(data[:4], byteorder="big", signed=True) & 0xffffffc0,
-        y=int.from_bytes(data[3:7], byteorder="big", signed=True) & 0xffffff0,
-        z=int.from_bytes(data[6:8], byteorder="big", signed=True) & 0xfff
-      ),
-      size=8
-    )
+  def serialize_into(value: Slot[T], out: bytearray):
+    return NotImplemented
 
-  @staticmethod
-  def serialize(value: Position):
-    return (value.x << 38 | value.y << 12 | value.z).to_bytes(8, byteorder="big", signed=True)
-    
 
+class PositionEncoder(Encoder[Position]):
 
-class AngleEncoder(Encoder[int]):
-  
-  @staticmethod
-  def parse(data: bytes):
-    return UnsignedByteEncoder.parse(data)
+  parse = staticmethod(parse_position)
+  serialize = staticmethod(serialize_position)
+  serialize_into = staticmethod(serialize_position_into)
 
-  @staticmethod
-  def serialize(value: int):
-    return UnsignedByteEncoder.serialize(value)
 
+class AngleEncoder(Encoder[int]):
+
+  parse = staticmethod(parse_u8)
+  serialize = staticmethod(serialize_u8)
+  serialize_into = staticmethod(serialize_u8_into)
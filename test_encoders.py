@@ -0,0 +1,244 @@
+import importlib.util
+import random
+import struct
+import sys
+
+import pytest
+
+
+def load_encoders(*blocked: str):
+  saved = {name: sys.modules.get(name) for name in blocked}
+  for name in blocked:
+    sys.modules[name] = None
+  try:
+    spec = importlib.util.find_spec("encoders")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+  finally:
+    for name, previous in saved.items():
+      if previous is None:
+        sys.modules.pop(name, None)
+      else:
+        sys.modules[name] = previous
+  return module
+
+
+pure = load_encoders("_varint")
+try:
+  import _varint
+except ImportError:
+  _varint = None
+native = load_encoders() if _varint is not None else None
+stdlib_json = load_encoders("_varint", "orjson")
+
+backends = [pytest.param(pure, id="python")]
+if native is not None:
+  backends.append(pytest.param(native, id="c"))
+
+requires_extension = pytest.mark.skipif(native is None, reason="_varint extension is not built")
+requires_orjson = pytest.mark.skipif(pure.orjson is None, reason="orjson is not installed")
+
+rng = random.Random(0)
+INT32_VALUES = [0, 1, 127, 128, 255, 300, 25565, 2147483647, -1, -2147483648] + [
+  rng.randint(-2147483648, 2147483647) >> rng.randint(0, 31) for _ in range(2000)
+]
+INT64_VALUES = [0, 1, 127, 128, 9223372036854775807, -1, -9223372036854775808] + [
+  rng.randint(-9223372036854775808, 9223372036854775807) >> rng.randint(0, 63) for _ in range(2000)
+]
+MALFORMED_VARINTS = [b"", b"\x80", b"\xff\xff", b"\xff" * 4, b"\xff" * 5, b"\xff" * 4 + b"\x7f"]
+MALFORMED_VARLONGS = [b"", b"\x80", b"\xff" * 9, b"\xff" * 10, b"\xff" * 9 + b"\x7f", b"\xff" * 9 + b"\x02"]
+
+
+def outcome(function, *args):
+  try:
+    return function(*args)
+  except ValueError as error:
+    return str(error)
+
+
+@pytest.mark.parametrize("encoders", backends)
+def test_varint_round_trip(encoders):
+  for value in INT32_VALUES:
+    data = encoders.serialize_varint(value)
+    assert len(data) == encoders.varint_size(value)
+    assert encoders.parse_varint(memoryview(data + b"\x80")) == (value, len(data))
+
+
+@pytest.mark.parametrize("encoders", backends)
+def test_varlong_round_trip(encoders):
+  for value in INT64_VALUES:
+    data = encoders.serialize_varlong(value)
+    assert len(data) == encoders.varlong_size(value)
+    assert encoders.parse_varlong(memoryview(data + b"\x80")) == (value, len(data))
+
+
+@pytest.mark.parametrize("encoders", backends)
+def test_size_rejects_out_of_range(encoders):
+  for size, serialize, value in (
+    (encoders.varint_size, encoders.serialize_varint, 2147483648),
+    (encoders.varint_size, encoders.serialize_varint, 2**40),
+    (encoders.varlong_size, encoders.serialize_varlong, -9223372036854775809),
+  ):
+    assert outcome(size, value) == outcome(serialize, value)
+
+
+@requires_extension
+def test_varint_parity():
+  for value in INT32_VALUES + [2147483648, -2147483649]:
+    assert outcome(pure.serialize_varint, value) == outcome(native.serialize_varint, value)
+  for data in MALFORMED_VARINTS:
+    assert outcome(pure.parse_varint, data) == outcome(native.parse_varint, data)
+
+
+@requires_extension
+def test_varlong_parity():
+  for value in INT64_VALUES + [9223372036854775808, -9223372036854775809]:
+    assert outcome(pure.serialize_varlong, value) == outcome(native.serialize_varlong, value)
+  for data in MALFORMED_VARLONGS:
+    assert outcome(pure.parse_varlong, data) == outcome(native.parse_varlong, data)
+
+
+@requires_extension
+def test_random_bytes_parity():
+  for _ in range(2000):
+    data = bytes(rng.getrandbits(8) | (0x80 if rng.random() < 0.8 else 0) for _ in range(rng.randint(0, 11)))
+    assert outcome(pure.parse_varint, data) == outcome(native.parse_varint, data)
+    assert outcome(pure.parse_varlong, data) == outcome(native.parse_varlong, data)
+    assert pure.valid_utf8(data) == native.valid_utf8(data)
+
+
+def test_json_is_compact():
+  for encoders in (pure, stdlib_json):
+    out = bytearray()
+    encoders.serialize_json_into({"a": [1, 2], "t": "é"}, out)
+    assert bytes(out) == b'\x14{"a":[1,2],"t":"\xc3\xa9"}'
+    for value in ({"t": "\ud800"}, {"t": object()}, {1: "a"}, 2**64):
+      with pytest.raises(ValueError, match="JSONTextComponentEncoder: Serialization error"):
+        encoders.serialize_json(value)
+    for text in (b'{"a":NaN}', b"Infinity", b"1e400", b'"\\ud800"'):
+      with pytest.raises(ValueError, match="JSONTextComponentEncoder: Parsing error"):
+        encoders.parse_json(encoders.serialize_varint(len(text)) + text)
+
+
+def json_outcome(function, *args):
+  try:
+    return function(*args)
+  except ValueError as error:
+    return str(error).split(":")[:2]
+
+
+@requires_orjson
+def test_json_backend_parity():
+  for value in (
+    {"a": [1, 2.5, -0.0, 1e16, 1e-7, 1.5e300], "t": "é\n\"\x00"}, [True, False, None],
+    float("nan"), float("inf"), -2**63, 2**64 - 1, 2**64, -2**63 - 1,
+    {1: "a"}, {"t": "\ud800"}, {"t": object()}, "\U0001f600",
+  ):
+    assert json_outcome(pure.serialize_json, value) == json_outcome(stdlib_json.serialize_json, value)
+  for text in (
+    b'{"a":1}', b'{"a":NaN}', b"-Infinity", b"1e400", b"18446744073709551615", b"18446744073709551616",
+    b"-9223372036854775809", b'"\\ud83d\\ude00"', b'"\\ud800"', b'{"a":1,}', b"\xff",
+  ):
+    data = pure.serialize_varint(len(text)) + text
+    assert json_outcome(pure.parse_json, data) == json_outcome(stdlib_json.parse_json, data)
+
+
+def test_parse_array():
+  data = struct.pack(">2000q", *range(-1000, 1000))
+  assert pure.LongEncoder.parse_array(data, 2000) == (tuple(range(-1000, 1000)), 16000)
+  if pure.np is not None:
+    values, size = pure.LongEncoder.parse_ndarray(data, 2000)
+    assert values.tolist() == list(range(-1000, 1000)) and size == 16000
+
+
+def test_parse_array_rejects_bad_counts():
+  data = struct.pack(">4i", 1, 2, 3, 4)
+  assert pure.IntEncoder.parse_array(data, 0) == ((), 0)
+  parsers = [pure.IntEncoder.parse_array, pure.FloatEncoder.parse_array]
+  if pure.np is not None:
+    parsers += [pure.IntEncoder.parse_ndarray, pure.FloatEncoder.parse_ndarray]
+  for parse in parsers:
+    for count in (-1, 5, 2**40):
+      with pytest.raises(ValueError, match=f"Encoder: Parsing error: Invalid array length {count} for 16 bytes"):
+        parse(data, count)
+
+
+@pytest.mark.parametrize("position", [
+  (18357644, 831, -20882616),
+  (-33554432, -2048, -33554432),
+  (33554431, 2047, 33554431),
+  (0, 0, 0),
+  (-1, -1, -1),
+])
+def test_position_round_trip(position):
+  data = pure.serialize_position(pure.Position(*position))
+  out = bytearray()
+  pure.serialize_position_into(pure.Position(*position), out)
+  assert bytes(out) == data
+  assert pure.parse_position(memoryview(data)) == (pure.Position(*position), 8)
+
+
+def test_position_protocol_example():
+  data = bytes.fromhex("4607632C15B4833F")
+  assert pure.parse_position(memoryview(data)) == (pure.Position(18357644, 831, -20882616), 8)
+  assert pure.serialize_position(pure.Position(18357644, 831, -20882616)) == data
+
+
+@pytest.mark.parametrize("position", [(2**25, 0, 0), (-2**25 - 1, 0, 0), (0, 2048, 0), (0, -2049, 0), (0, 0, 2**25)])
+def test_position_rejects_out_of_range(position):
+  for serialize in (pure.serialize_position, lambda value: pure.serialize_position_into(value, bytearray())):
+    with pytest.raises(ValueError, match="PositionEncoder: Serialization error: .* is not in range"):
+      serialize(pure.Position(*position))
+
+
+def test_string_round_trip():
+  data = pure.serialize_string("é" * 5)
+  assert data[0] == 10 and len(data) == 1 + 10
+  assert pure.parse_string(memoryview(data + b"\x00")) == ("é" * 5, 11)
+
+
+def test_string_rejects_bad_payloads():
+  with pytest.raises(ValueError, match="StringEncoder: Parsing error: Expected 10 bytes, got 9"):
+    pure.parse_string(memoryview(pure.serialize_string("é" * 5)[:-1]))
+  with pytest.raises(ValueError, match="StringEncoder: Parsing error: Invalid string length 32768"):
+    pure.parse_string(memoryview(pure.serialize_varint(65536) + ("é" * 32768).encode()))
+  with pytest.raises(ValueError, match="StringEncoder: Serialization error: Invalid string length 32768"):
+    pure.serialize_string("a" * 32768)
+
+
+def test_identifier():
+  assert pure.parse_identifier(memoryview(pure.serialize_string("stone"))) == (pure.Identifier("minecraft", "stone"), 6)
+  assert pure.parse_identifier(memoryview(pure.serialize_string("a:b/c.d"))) == (pure.Identifier("a", "b/c.d"), 8)
+  for text in ("A:b", "a:b:c", "a:b\n"):
+    with pytest.raises(ValueError, match="IdentifierEncoder: Parsing error"):
+      pure.parse_identifier(memoryview(pure.serialize_string(text)))
+
+
+SAMPLES = {
+  "boolean": [True, False],
+  "byte": [-128, 0, 127],
+  "unsigned_byte": [0, 255],
+  "short": [-32768, 32767],
+  "unsigned_short": [0, 65535],
+  "int": [-2147483648, 2147483647],
+  "long": [-9223372036854775808, 9223372036854775807],
+  "float": [1.5, -0.0],
+  "double": [1e300, -2.5],
+  "string": ["a", "é" * 5],
+  "json_text_component": [{"text": "é"}, "a"],
+  "identifier": [pure.Identifier("minecraft", "stone")],
+  "varint": [0, -1, 25565],
+  "varlong": [0, -1, 2**62],
+  "position": [pure.Position(18357644, 831, -20882616)],
+  "angle": [0, 255],
+}
+
+
+@pytest.mark.parametrize("encoders", backends)
+@pytest.mark.parametrize("key", sorted(SAMPLES))
+def test_serializers_into_match_serializers(encoders, key):
+  assert encoders.SERIALIZERS_INTO.keys() == encoders.SERIALIZERS.keys() == SAMPLES.keys()
+  for value in SAMPLES[key]:
+    out = bytearray(b"prefix")
+    encoders.SERIALIZERS_INTO[key](value, out)
+    assert bytes(out) == b"prefix" + encoders.SERIALIZERS[key](value)